@@ -683,6 +683,33 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+####################################
+# WEB SEARCH
+####################################
+
+VALYU_SEARCH_CACHE_TTL = os.environ.get("VALYU_SEARCH_CACHE_TTL", "300")
+try:
+    VALYU_SEARCH_CACHE_TTL = int(VALYU_SEARCH_CACHE_TTL)
+except Exception:
+    VALYU_SEARCH_CACHE_TTL = 300
+
+VALYU_CONTENTS_CACHE_TTL = os.environ.get("VALYU_CONTENTS_CACHE_TTL", "1800")
+try:
+    VALYU_CONTENTS_CACHE_TTL = int(VALYU_CONTENTS_CACHE_TTL)
+except Exception:
+    VALYU_CONTENTS_CACHE_TTL = 1800
+
+VALYU_MAX_BATCH = os.environ.get("VALYU_MAX_BATCH", "10")
+try:
+    VALYU_MAX_BATCH = int(VALYU_MAX_BATCH)
+except Exception:
+    VALYU_MAX_BATCH = 10
+
+# The Valyu Contents API accepts at most 10 URLs per request
+if not 1 <= VALYU_MAX_BATCH <= 10:
+    log.warning(f"VALYU_MAX_BATCH={VALYU_MAX_BATCH} is outside 1-10, clamping it")
+    VALYU_MAX_BATCH = min(max(VALYU_MAX_BATCH, 1), 10)
+
 ####################################
 # OFFLINE_MODE
 ####################################
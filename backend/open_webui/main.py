@@ -100,6 +100,7 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.retrieval.loaders.valyu import close_valyu_sessions
 
 from open_webui.internal.db import Session, engine
 
@@ -599,6 +600,8 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    await close_valyu_sessions()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1,13 +1,334 @@
+import asyncio
+import json
 import logging
-from typing import Iterator, List, Literal, Union
+import queue
+import re
+import threading
+import weakref
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from threading import RLock
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Union,
+)
 
+import aiohttp
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    AIOHTTP_CLIENT_SESSION_SSL,
+    AIOHTTP_CLIENT_TIMEOUT,
+    SRC_LOG_LEVELS,
+    VALYU_CONTENTS_CACHE_TTL,
+    VALYU_MAX_BATCH,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from valyu import Valyu
+
+    _VALYU_IMPORT_ERROR = None
+except ImportError as e:
+    Valyu = None
+    _VALYU_IMPORT_ERROR = e
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+VALYU_API_BASE_URL = "https://api.valyu.ai/v1"
+
+# Maximum number of URLs accepted by a synchronous Contents API request
+VALYU_CONTENTS_MAX_URLS = 10
+
+# Recently extracted pages keyed by (api_key, url, response_length,
+# extract_effort), bounded by the total length of the cached page content
+VALYU_URL_CACHE_MAX_CHARS = 64 * 1024 * 1024
+_URL_CACHE: TTLCache = TTLCache(
+    maxsize=VALYU_URL_CACHE_MAX_CHARS,
+    ttl=max(VALYU_CONTENTS_CACHE_TTL, 1),
+    getsizeof=lambda entry: max(len(entry[0]), 1),
+)
+_URL_LOCK = RLock()
+
+# In-flight requests shared by concurrent callers with the same key
+_INFLIGHT: dict[Hashable, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# In-flight Contents requests per URL cache key, shared across loaders
+_URL_FLIGHTS: dict[Hashable, Future] = {}
+_ASYNC_URL_FLIGHTS: dict[Hashable, asyncio.Future] = {}
+
+
+def singleflight(key: Hashable, fn: Callable, *args, **kwargs):
+    """Run ``fn`` once for concurrent callers sharing ``key``.
+
+    The first caller executes ``fn``; callers arriving while it is still
+    running wait for and receive the same result (or exception).
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT[key] = future
+
+    if not is_leader:
+        return future.result()
+
+    try:
+        result = fn(*args, **kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+# Contents API statuses that may be caused by a single URL in the batch
+_SPLITTABLE_STATUSES = frozenset({400, 422})
+
+# Older SDKs that do not accept our session only expose the status of a failed
+# request as a tx_id of "error-<status>", and only if the server sent no tx_id
+_TX_ID_STATUS = re.compile(r"^error-(\d{3})$")
+
+# HTTP status of the last Valyu SDK request made by the current thread
+_sdk_status = threading.local()
+
+# Retries connection-level failures of the async REST path. The SDK client
+# reports errors in its response instead of raising, so its transport errors
+# and HTTP 429/5xx are retried by the session adapter in get_valyu_client.
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.5, max=8),
+    retry=retry_if_exception_type(
+        (TimeoutError, ConnectionError, aiohttp.ClientConnectionError)
+    ),
+    reraise=True,
+)
+
+# Markers passed from the producer thread to the consuming generator
+_SENTINEL = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _record_sdk_status(response: requests.Response, *args, **kwargs) -> None:
+    _sdk_status.value = response.status_code
+
+
+def get_response_status(response) -> Optional[int]:
+    """Return the HTTP status of a failed Valyu response, if it is known."""
+    status = getattr(response, "status", None)
+    if isinstance(status, int):
+        return status
+    match = _TX_ID_STATUS.match(str(getattr(response, "tx_id", None) or ""))
+    return int(match.group(1)) if match else None
+
+
+def _match_requested_url(url: str, batch_urls: List[str]) -> Optional[str]:
+    """Return the requested URL a result belongs to, if it can be told."""
+    if url in batch_urls:
+        return url
+    if len(batch_urls) == 1:
+        # The API may echo a normalised form of a single requested URL
+        return batch_urls[0]
+    return None
+
+
+def _chunks(urls: List[str], size: int) -> Iterator[List[str]]:
+    """Split URLs into consecutive batches of at most ``size`` items."""
+    it = iter(urls)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class UrlParts(NamedTuple):
+    host: str
+    path: str
+    scheme: str
+
+
+@lru_cache(maxsize=8192)
+def get_url_parts(url: str) -> UrlParts:
+    """Return the parsed host, path and scheme of a URL, memoized per URL."""
+    parts = urlsplit(url)
+    return UrlParts(host=parts.hostname or "", path=parts.path, scheme=parts.scheme)
+
+
+@dataclass(slots=True)
+class ValyuResult:
+    url: str = ""
+    title: str = ""
+    content: Any = ""
+    data_type: str = "unstructured"
+    metadata: Optional[dict] = None
+
+    @classmethod
+    def from_result(cls, result) -> "ValyuResult":
+        """Materialize a Valyu SDK or REST result into a ValyuResult."""
+        metadata = getattr(result, "metadata", None)
+        return cls(
+            url=getattr(result, "url", "") or "",
+            title=getattr(result, "title", "") or "",
+            content=getattr(result, "content", "")
+            or getattr(result, "text", "")
+            or getattr(result, "snippet", "")
+            or "",
+            data_type=getattr(result, "data_type", "unstructured"),
+            metadata=metadata if isinstance(metadata, dict) and metadata else None,
+        )
+
+
+@lru_cache(maxsize=32)
+def get_valyu_client(api_key: str):
+    """Return a Valyu client for the given API key, cached per key.
+
+    Reusing the client keeps its HTTPS connection pool alive across searches
+    and content batches instead of opening a new connection for every call.
+    """
+    if Valyu is None:
+        raise ImportError(
+            "valyu package not found. Please install it with: pip install valyu"
+        ) from _VALYU_IMPORT_ERROR
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=None,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # The SDK hides HTTP statuses; record them to tell bad URLs from other errors
+    session.hooks["response"].append(_record_sdk_status)
+
+    try:
+        return Valyu(api_key=api_key, session=session)
+    except TypeError:
+        # Older SDK versions do not accept a custom session
+        session.close()
+        return Valyu(api_key=api_key)
+
+
+# Keep-alive sessions per event loop, keyed by trust_env within each loop
+_valyu_sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_valyu_sessions_lock = threading.Lock()
+
+
+def get_valyu_session(trust_env: bool = False) -> aiohttp.ClientSession:
+    """Return a keep-alive aiohttp session shared by async Valyu calls.
+
+    Sessions are bound to the running event loop, so one is kept per loop and
+    recreated if it has been closed.
+    """
+    loop = asyncio.get_running_loop()
+    with _valyu_sessions_lock:
+        sessions = _valyu_sessions.setdefault(loop, {})
+        session = sessions.get(trust_env)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32, limit_per_host=16, keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                trust_env=trust_env,
+            )
+            sessions[trust_env] = session
+    return session
+
+
+async def close_valyu_sessions() -> None:
+    """Close the Valyu sessions bound to the running event loop."""
+    with _valyu_sessions_lock:
+        sessions = _valyu_sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        if not session.closed:
+            await session.close()
+
+
+async def post_valyu(
+    api_key: str, endpoint: str, payload: dict, trust_env: bool = False
+) -> SimpleNamespace:
+    """POST a request to the Valyu REST API using the shared session.
+
+    Requests carry the same headers as the ``valyu`` SDK client, and the JSON
+    response is converted into attribute-accessible objects so that it can be
+    consumed the same way as the responses of the SDK.
+    """
+    session = get_valyu_session(trust_env)
+    async with session.post(
+        f"{VALYU_API_BASE_URL}/{endpoint}",
+        json=payload,
+        headers=get_valyu_client(api_key).headers,
+        ssl=AIOHTTP_CLIENT_SESSION_SSL,
+    ) as response:
+        try:
+            data = await response.json(
+                content_type=None, loads=orjson.loads if orjson else json.loads
+            )
+        except ValueError:
+            data = None
+
+    if not isinstance(data, dict):
+        data = {}
+
+    if response.status >= 400:
+        return SimpleNamespace(
+            success=False,
+            error=data.get("error", f"HTTP Error: {response.status}"),
+            status=response.status,
+            results=[],
+        )
+
+    return SimpleNamespace(
+        success=data.get("success", True),
+        error=data.get("error"),
+        status=response.status,
+        results=[
+            SimpleNamespace(**result)
+            for result in data.get("results") or []
+            if isinstance(result, dict)
+        ],
+    )
+
 
 class ValyuLoader(BaseLoader):
     """Extract web page content from URLs using Valyu Contents API.
@@ -22,6 +343,9 @@ class ValyuLoader(BaseLoader):
             'large' (100k), 'max', or custom integer.
         extract_effort: Processing effort level ('auto', 'normal', 'high').
         continue_on_failure: Whether to continue if extraction of a URL fails.
+        max_concurrency: Maximum number of batches requested concurrently.
+        batch_size: Number of URLs sent per Contents API request.
+        trust_env: Whether the async path honors proxy settings from the environment.
     """
 
     def __init__(
@@ -31,6 +355,9 @@ class ValyuLoader(BaseLoader):
         response_length: Literal["short", "medium", "large", "max"] = "max",
         extract_effort: Literal["auto", "normal", "high"] = "auto",
         continue_on_failure: bool = True,
+        max_concurrency: int = 5,
+        batch_size: Optional[int] = None,
+        trust_env: bool = False,
     ) -> None:
         """Initialize Valyu Contents client.
 
@@ -42,75 +369,441 @@ class ValyuLoader(BaseLoader):
             extract_effort: Processing effort level ('auto', 'normal', 'high').
                 'auto' automatically determines the best effort level.
             continue_on_failure: Whether to continue if extraction of a URL fails.
+            max_concurrency: Maximum number of batches requested concurrently.
+            batch_size: Number of URLs sent per Contents API request. Defaults to
+                VALYU_MAX_BATCH and must not exceed the API's per-request limit.
+            trust_env: Whether the async path honors proxy settings from the
+                environment.
         """
         if not urls:
             raise ValueError("At least one URL must be provided.")
 
-        try:
-            from valyu import Valyu
-        except ImportError:
-            raise ImportError(
-                "valyu package not found. Please install it with: pip install valyu"
-            )
-
         self.api_key = api_key
-        self.urls = urls if isinstance(urls, list) else [urls]
+        # Deduplicate while preserving order
+        self.urls = list(dict.fromkeys(urls if isinstance(urls, list) else [urls]))
         self.response_length = response_length
         self.extract_effort = extract_effort
         self.continue_on_failure = continue_on_failure
-        self.client = Valyu(api_key=api_key)
+        self.max_concurrency = max(1, max_concurrency)
+        # Bounds in-flight requests, including per-URL fallbacks of failed batches
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.trust_env = trust_env
 
-    def lazy_load(self) -> Iterator[Document]:
-        """Extract and yield documents from the URLs using Valyu Contents API."""
-        batch_size = 10
-        for i in range(0, len(self.urls), batch_size):
-            batch_urls = self.urls[i : i + batch_size]
-            try:
-                # Make the API call
-                response = self.client.contents(
-                    urls=batch_urls,
-                    response_length=self.response_length,
-                    extract_effort=self.extract_effort,
+        if batch_size is None:
+            batch_size = VALYU_MAX_BATCH
+        if not 1 <= batch_size <= VALYU_CONTENTS_MAX_URLS:
+            raise ValueError(
+                f"batch_size must be between 1 and {VALYU_CONTENTS_MAX_URLS}."
+            )
+        self.batch_size = batch_size
+        self.client = get_valyu_client(api_key)
+
+    def _get_cache_key(self, url: str) -> tuple:
+        return (self.api_key, url, self.response_length, self.extract_effort)
+
+    def _split_cached(self) -> tuple[List[Document], List[str]]:
+        """Split the URLs into documents served from cache and URLs to fetch."""
+        if VALYU_CONTENTS_CACHE_TTL <= 0:
+            return [], list(self.urls)
+
+        cached_documents = []
+        urls_to_fetch = []
+        with _URL_LOCK:
+            for url in self.urls:
+                cached = _URL_CACHE.get(self._get_cache_key(url))
+                if cached is None:
+                    urls_to_fetch.append(url)
+                    continue
+                content, metadata = cached
+                cached_documents.append(
+                    Document(page_content=content, metadata=dict(metadata))
+                )
+        return cached_documents, urls_to_fetch
+
+    def _request_contents(self, batch_urls: List[str]):
+        _sdk_status.value = None
+        response = self.client.contents(
+            urls=batch_urls,
+            response_length=self.response_length,
+            extract_effort=self.extract_effort,
+        )
+        status = _sdk_status.value
+        if response.success or status is None:
+            return response
+
+        # Expose the HTTP status the same way as post_valyu
+        return SimpleNamespace(
+            success=False,
+            error=getattr(response, "error", None),
+            status=status,
+            results=[],
+        )
+
+    @_retry_transient
+    async def _arequest_contents(self, batch_urls: List[str]):
+        return await post_valyu(
+            self.api_key,
+            "contents",
+            {
+                "urls": batch_urls,
+                "response_length": self.response_length,
+                "extract_effort": self.extract_effort,
+            },
+            trust_env=self.trust_env,
+        )
+
+    def _should_split(self, batch_urls: List[str], response, error) -> bool:
+        """Whether a failed batch should be retried one URL at a time.
+
+        Only request errors that can be caused by a single bad URL qualify;
+        auth, quota, rate limit, server and connection failures would fail
+        for every URL alike.
+        """
+        if not self.continue_on_failure or len(batch_urls) <= 1:
+            return False
+        if error is not None or response.success:
+            return False
+        return get_response_status(response) in _SPLITTABLE_STATUSES
+
+    def _merge_responses(self, fetched: list) -> SimpleNamespace:
+        """Combine fetched parts into one successful response, logging failures."""
+        results = []
+        for urls, response, error in fetched:
+            if error is None and response.success:
+                results.extend(getattr(response, "results", None) or ())
+            else:
+                log.error(
+                    "Error extracting content from %s: %s",
+                    urls,
+                    error or getattr(response, "error", "Unknown error"),
+                )
+        return SimpleNamespace(success=True, error=None, results=results)
+
+    def _combine_fetched(self, batch_urls: List[str], fetched: list) -> tuple:
+        """Combine the fetched parts of a batch into one ``_fetch_batch`` result."""
+        if not self.continue_on_failure:
+            for urls, response, error in fetched:
+                if error is not None or not response.success:
+                    return batch_urls, response, error
+        return batch_urls, self._merge_responses(fetched), None
+
+    def _split_by_url(self, fetched: tuple) -> dict:
+        """Split a fetched ``(urls, response, exception)`` tuple per requested URL."""
+        urls, response, error = fetched
+        if error is not None or not response.success:
+            return {url: ([url], response, error) for url in urls}
+
+        results = {url: [] for url in urls}
+        for result in getattr(response, "results", None) or ():
+            url = _match_requested_url(getattr(result, "url", None), urls)
+            if url is not None:
+                results[url].append(result)
+        return {
+            url: ([url], SimpleNamespace(success=True, error=None, results=items), None)
+            for url, items in results.items()
+        }
+
+    def _join_flights(self, flights: dict, keys: dict, new_future: Callable):
+        """Split URLs into ones already in flight and ones this call will lead."""
+        with _INFLIGHT_LOCK:
+            followed = {
+                url: flights[key] for url, key in keys.items() if key in flights
+            }
+            led = {url: new_future() for url in keys if url not in followed}
+            for url, future in led.items():
+                flights[keys[url]] = future
+        return followed, led
+
+    def _land_flights(self, flights: dict, keys: dict, led: dict, fetched) -> None:
+        """Hand the outcome of each led URL to its waiting callers."""
+        outcomes = self._split_by_url(fetched) if fetched is not None else {}
+        with _INFLIGHT_LOCK:
+            for url, future in led.items():
+                flights.pop(keys[url], None)
+                future.set_result(
+                    outcomes.get(url)
+                    or ([url], None, RuntimeError(f"Valyu request for {url} failed"))
                 )
 
-                # Check if the request was successful
-                if not response.success:
-                    error_msg = getattr(response, "error", "Unknown error")
-                    log.error(
-                        f"Valyu Contents API request failed for batch {batch_urls}: {error_msg}"
-                    )
-                    if not self.continue_on_failure:
-                        raise Exception(f"Valyu API error: {error_msg}")
+    def _request_batch(self, batch_urls: List[str]) -> tuple:
+        """Request a batch, retrying it per URL if it is rejected as a bad request.
+
+        Transient failures are retried by the client's session. If the batch
+        is rejected as a bad request, each URL is retried on its own so that
+        one bad URL does not discard the whole batch.
+        """
+        response, error = None, None
+        try:
+            with self._request_slots:
+                response = self._request_contents(batch_urls)
+        except Exception as e:
+            error = e
+
+        if not self._should_split(batch_urls, response, error):
+            return batch_urls, response, error
+
+        log.warning("Retrying failed Valyu batch one URL at a time: %s", batch_urls)
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(batch_urls))
+        ) as executor:
+            fetched = list(
+                executor.map(lambda url: self._request_batch([url]), batch_urls)
+            )
+        return batch_urls, self._merge_responses(fetched), None
+
+    def _fetch_batch(self, batch_urls: List[str]):
+        """Request a single batch from the Valyu Contents API.
+
+        URLs that another loader is already fetching with the same API key and
+        options are waited for instead of being requested again.
+
+        Returns a ``(batch_urls, response, exception)`` tuple so that errors
+        can be handled on the consuming side in submission-independent order.
+        """
+        keys = {url: self._get_cache_key(url) for url in batch_urls}
+        followed, led = self._join_flights(_URL_FLIGHTS, keys, Future)
+
+        fetched = None
+        try:
+            if led:
+                fetched = self._request_batch(list(led))
+        finally:
+            self._land_flights(_URL_FLIGHTS, keys, led, fetched)
+
+        if not followed:
+            return fetched
+        parts = [fetched] if fetched is not None else []
+        parts.extend(future.result() for future in followed.values())
+        return self._combine_fetched(batch_urls, parts)
+
+    async def _arequest_batch(
+        self, batch_urls: List[str], semaphore: asyncio.Semaphore
+    ) -> tuple:
+        """Async counterpart of ``_request_batch`` using the Valyu REST API."""
+        response, error = None, None
+        try:
+            async with semaphore:
+                response = await self._arequest_contents(batch_urls)
+        except Exception as e:
+            error = e
+
+        if not self._should_split(batch_urls, response, error):
+            return batch_urls, response, error
+
+        log.warning("Retrying failed Valyu batch one URL at a time: %s", batch_urls)
+        fetched = await asyncio.gather(
+            *[self._arequest_batch([url], semaphore) for url in batch_urls]
+        )
+        return batch_urls, self._merge_responses(fetched), None
+
+    async def _afetch_batch(self, batch_urls: List[str], semaphore: asyncio.Semaphore):
+        """Async counterpart of ``_fetch_batch``."""
+        # Futures are bound to their event loop, so keep flights per loop
+        loop = asyncio.get_running_loop()
+        keys = {url: (loop, self._get_cache_key(url)) for url in batch_urls}
+        followed, led = self._join_flights(_ASYNC_URL_FLIGHTS, keys, loop.create_future)
+
+        fetched = None
+        try:
+            if led:
+                fetched = await self._arequest_batch(list(led), semaphore)
+        finally:
+            self._land_flights(_ASYNC_URL_FLIGHTS, keys, led, fetched)
+
+        if not followed:
+            return fetched
+        parts = [fetched] if fetched is not None else []
+        for future in followed.values():
+            parts.append(await asyncio.shield(future))
+        return self._combine_fetched(batch_urls, parts)
+
+    def _process_response(self, batch_urls: List[str], response) -> Iterator[Document]:
+        """Yield documents from a Valyu Contents API response."""
+        # Check if the request was successful
+        if not response.success:
+            error_msg = getattr(response, "error", "Unknown error")
+            log.error(
+                "Valyu Contents API request failed for batch %s: %s",
+                batch_urls,
+                error_msg,
+            )
+            if not self.continue_on_failure:
+                raise Exception(f"Valyu API error: {error_msg}")
+            return
+
+        # Process successful results
+        results = getattr(response, "results", None) or ()
+        if not results:
+            log.warning("No results returned for batch %s", batch_urls)
+            return
+
+        for raw_result in results:
+            result = ValyuResult.from_result(raw_result)
+
+            if not result.content:
+                log.warning("No content extracted from %s", result.url)
+                continue
+
+            # Build metadata; source and URL parts always come from the result URL
+            if result.metadata:
+                metadata = {
+                    **result.metadata,
+                    "source": result.url,
+                    **get_url_parts(result.url)._asdict(),
+                }
+            else:
+                metadata = {
+                    "source": result.url,
+                    **get_url_parts(result.url)._asdict(),
+                }
+
+            # Cache under the requested URL so _split_cached finds it again
+            requested_url = _match_requested_url(result.url, batch_urls)
+            if requested_url is not None and VALYU_CONTENTS_CACHE_TTL > 0:
+                try:
+                    with _URL_LOCK:
+                        _URL_CACHE[self._get_cache_key(requested_url)] = (
+                            result.content,
+                            dict(metadata),
+                        )
+                except ValueError:
+                    # Page is larger than the whole cache budget
+                    log.debug("Not caching oversized page %s", requested_url)
+
+            yield Document(
+                page_content=result.content,
+                metadata=metadata,
+            )
+
+    def _iter_fetched(self, batches: List[List[str]]) -> Iterator[tuple]:
+        """Yield the ``_fetch_batch`` result of each batch as it completes."""
+        if len(batches) == 1:
+            # A single batch needs no thread pool
+            yield self._fetch_batch(batches[0])
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(batches))
+        )
+        try:
+            futures = [
+                executor.submit(self._fetch_batch, batch_urls) for batch_urls in batches
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_documents(self, urls: List[str]) -> Iterator[Document]:
+        """Fetch the given URLs in concurrent batches and yield their documents."""
+        fetched = self._iter_fetched(list(_chunks(urls, self.batch_size)))
+        try:
+            for batch_urls, response, error in fetched:
+                try:
+                    if error is not None:
+                        raise error
+                    yield from self._process_response(batch_urls, response)
+                except Exception as e:
+                    if self.continue_on_failure:
+                        log.error(
+                            "Error extracting content from batch %s: %s", batch_urls, e
+                        )
+                    else:
+                        raise e
+        finally:
+            fetched.close()
+
+    def _producer(self, urls: List[str], q: queue.Queue, stop: threading.Event) -> None:
+        """Push fetched documents into the queue until done or stopped."""
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
                     continue
+            return False
+
+        documents = self._fetch_documents(urls)
+        try:
+            for document in documents:
+                if not put(document):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            documents.close()
+            # Always terminate the stream so the consumer never waits forever
+            put(_SENTINEL)
 
-                # Process successful results
-                if hasattr(response, "results") and response.results:
-                    for result in response.results:
-                        url = getattr(result, "url", "")
-                        content = getattr(result, "content", "")
+    def lazy_load(self) -> Iterator[Document]:
+        """Extract and yield documents from the URLs using Valyu Contents API.
+
+        Batches are fetched concurrently on a background thread, so network
+        I/O overlaps with the consumer's processing of yielded documents.
+        """
+        cached_documents, urls_to_fetch = self._split_cached()
+        yield from cached_documents
+        if not urls_to_fetch:
+            return
+
+        q = queue.Queue(maxsize=32)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._producer, args=(urls_to_fetch, q, stop), daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                try:
+                    item = q.get(timeout=0.5)
+                except queue.Empty:
+                    if not producer.is_alive() and q.empty():
+                        raise RuntimeError("Valyu producer thread exited unexpectedly")
+                    continue
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            stop.set()
 
-                        if not content:
-                            log.warning(f"No content extracted from {url}")
-                            continue
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """Extract and yield documents asynchronously using Valyu Contents API.
 
-                        # Build metadata
-                        metadata = {"source": url}
+        Batches are requested concurrently on the event loop and documents are
+        yielded as soon as each batch completes.
+        """
+        cached_documents, urls_to_fetch = self._split_cached()
+        for document in cached_documents:
+            yield document
+        if not urls_to_fetch:
+            return
 
-                        # Add any additional metadata from the result
-                        if hasattr(result, "metadata") and result.metadata:
-                            result_metadata = result.metadata
-                            if isinstance(result_metadata, dict):
-                                metadata.update(result_metadata)
+        batches = list(_chunks(urls_to_fetch, self.batch_size))
 
-                        yield Document(
-                            page_content=content,
-                            metadata=metadata,
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._afetch_batch(batch_urls, semaphore))
+            for batch_urls in batches
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                batch_urls, response, error = await task
+                try:
+                    if error is not None:
+                        raise error
+                    for document in self._process_response(batch_urls, response):
+                        yield document
+                except Exception as e:
+                    if self.continue_on_failure:
+                        log.error(
+                            "Error extracting content from batch %s: %s", batch_urls, e
                         )
-                else:
-                    log.warning(f"No results returned for batch {batch_urls}")
-
-            except Exception as e:
-                if self.continue_on_failure:
-                    log.error(f"Error extracting content from batch {batch_urls}: {e}")
-                else:
-                    raise e
+                    else:
+                        raise e
+        finally:
+            for task in tasks:
+                task.cancel()
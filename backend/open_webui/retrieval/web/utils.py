@@ -440,6 +440,7 @@ class SafeValyuLoader(BaseLoader, RateLimitMixin, URLProcessingMixin):
                 response_length=self.response_length,
                 extract_effort=self.extract_effort,
                 continue_on_failure=self.continue_on_failure,
+                trust_env=self.trust_env,
             )
             yield from loader.lazy_load()
         except Exception as e:
@@ -473,6 +474,7 @@ class SafeValyuLoader(BaseLoader, RateLimitMixin, URLProcessingMixin):
                 response_length=self.response_length,
                 extract_effort=self.extract_effort,
                 continue_on_failure=self.continue_on_failure,
+                trust_env=self.trust_env,
             )
             async for document in loader.alazy_load():
                 yield document
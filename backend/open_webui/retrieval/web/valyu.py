@@ -1,13 +1,143 @@
 import logging
 import json
-from typing import Optional
-
-from open_webui.retrieval.web.main import SearchResult, get_filtered_results
-from open_webui.env import SRC_LOG_LEVELS
+from threading import RLock
+from typing import Callable, Iterator, Optional
+
+import validators
+from cachetools import TTLCache
+
+from open_webui.retrieval.loaders.valyu import (
+    ValyuResult,
+    get_url_parts,
+    get_valyu_client,
+    singleflight,
+)
+from open_webui.retrieval.web.main import SearchResult
+from open_webui.env import SRC_LOG_LEVELS, VALYU_SEARCH_CACHE_TTL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=max(VALYU_SEARCH_CACHE_TTL, 1))
+_SEARCH_LOCK = RLock()
+
+
+def _get_search_cache_key(
+    api_key: str, query: str, count: int, filter_list: Optional[list[str]] = None
+) -> tuple:
+    return (api_key, query.strip().lower(), count, tuple(sorted(filter_list or ())))
+
+
+def _copy_results(results: list[SearchResult]) -> list[SearchResult]:
+    # Cached and shared results must not be mutated through a caller's copy
+    return [result.model_copy() for result in results]
+
+
+def _get_cached_results(key: tuple) -> Optional[list[SearchResult]]:
+    if VALYU_SEARCH_CACHE_TTL <= 0:
+        return None
+    with _SEARCH_LOCK:
+        results = _SEARCH_CACHE.get(key)
+    return _copy_results(results) if results is not None else None
+
+
+def _set_cached_results(key: tuple, results: list[SearchResult]) -> None:
+    if VALYU_SEARCH_CACHE_TTL <= 0:
+        return
+    with _SEARCH_LOCK:
+        _SEARCH_CACHE[key] = results
+
+
+def _make_domain_filter(
+    filter_list: Optional[list[str]] = None,
+) -> Callable[[str], bool]:
+    """Build a predicate matching valid URLs whose hostname is in a filtered domain.
+
+    A domain with a leading dot (``.example.com``) matches its subdomains only;
+    without one (``example.com``) it matches the domain and its subdomains.
+    """
+    exact_domains = set()
+    suffixes = []
+    for domain in filter_list or ():
+        domain = domain.lower()
+        if not domain:
+            continue
+        if domain.startswith("."):
+            suffixes.append(domain)
+        else:
+            exact_domains.add(domain)
+            suffixes.append(f".{domain}")
+    if not suffixes:
+        return lambda url: True
+
+    suffixes = tuple(suffixes)
+
+    def is_allowed(url: str) -> bool:
+        if not validators.url(url):
+            return False
+        host = get_url_parts(url).host
+        return host in exact_domains or host.endswith(suffixes)
+
+    return is_allowed
+
+
+def _dump_structured_content(content) -> str:
+    if orjson is not None:
+        return orjson.dumps(
+            content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(content, indent=2)
+
+
+def _iter_search_results(
+    response, is_allowed: Callable[[str], bool]
+) -> Iterator[SearchResult]:
+    """Yield SearchResult objects for the allowed results of a Valyu response."""
+    for raw_result in getattr(response, "results", None) or ():
+        result = ValyuResult.from_result(raw_result)
+        url = result.url
+        if not (url and is_allowed(url)):
+            continue
+
+        content = result.content
+
+        # Convert structured data to string if needed
+        if result.data_type == "structured" and content:
+            if isinstance(content, dict) or isinstance(content, list):
+                try:
+                    content = _dump_structured_content(content)
+                except Exception as e:
+                    log.warning(
+                        "Failed to convert structured content to JSON string: %s", e
+                    )
+                    content = str(content)
+            elif not isinstance(content, str):
+                content = str(content)
+
+        yield SearchResult(link=url, title=result.title, snippet=content)
+
+
+def _get_search_results(
+    response, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    """Convert a Valyu Search API response into a list of SearchResult objects."""
+    # Check if the request was successful
+    if not response.success:
+        error_msg = getattr(response, "error", "Unknown error")
+        log.error("Valyu Search API request failed: %s", error_msg)
+        return []
+
+    results = list(_iter_search_results(response, _make_domain_filter(filter_list)))
+
+    log.info("Found %d results", len(results))
+
+    return results
+
 
 def search_valyu(
     api_key: str,
@@ -27,80 +157,35 @@ def search_valyu(
         list[SearchResult]: A list of search results
     """
     try:
-        from valyu import Valyu
-    except ImportError:
-        log.error("valyu package not found. Please install it with: pip install valyu")
+        client = get_valyu_client(api_key)
+    except ImportError as e:
+        log.error(str(e))
         return []
 
-    log.info(f"Searching with Valyu for query: {query}")
+    key = _get_search_cache_key(api_key, query, count, filter_list)
+    cached_results = _get_cached_results(key)
+    if cached_results is not None:
+        log.debug("Using cached Valyu results for query: %s", query)
+        return cached_results
 
-    try:
-        # Initialize Valyu client
-        client = Valyu(api_key=api_key)
-
-        # Perform search
-        response = client.search(
-            query=query,
-            max_num_results=count or 10,
-        )
-
-        # Check if the request was successful
-        if not response.success:
-            error_msg = getattr(response, "error", "Unknown error")
-            log.error(f"Valyu Search API request failed: {error_msg}")
-            return []
-
-        # Extract results
-        results = []
-        if hasattr(response, "results") and response.results:
-            for result in response.results:
-                url = getattr(result, "url", "")
-                title = getattr(result, "title", "")
-                content = (
-                    getattr(result, "content", "")
-                    or getattr(result, "text", "")
-                    or getattr(result, "snippet", "")
-                )
-                data_type = getattr(result, "data_type", "unstructured")
-
-                # Convert structured data to string if needed
-                if data_type == "structured" and content:
-                    if isinstance(content, dict) or isinstance(content, list):
-                        try:
-                            content = json.dumps(content, indent=2)
-                        except Exception as e:
-                            log.warning(
-                                f"Failed to convert structured content to JSON string: {e}"
-                            )
-                            content = str(content)
-                    elif not isinstance(content, str):
-                        content = str(content)
-
-                if url:
-                    results.append(
-                        {
-                            "url": url,
-                            "title": title,
-                            "content": content,
-                            "data_type": data_type,
-                        }
-                    )
+    def _search() -> list[SearchResult]:
+        log.info("Searching with Valyu for query: %s", query)
 
-        # Apply domain filtering if provided
-        if filter_list and results:
-            results = get_filtered_results(results, filter_list)
+        try:
+            # Perform search
+            response = client.search(
+                query=query,
+                max_num_results=count or 10,
+            )
 
-        log.info(f"Found {len(results)} results")
+            results = _get_search_results(response, filter_list)
+            if response.success:
+                _set_cached_results(key, results)
+            return results
 
-        return [
-            SearchResult(
-                link=result["url"],
-                title=result.get("title", ""),
-                snippet=result.get("content", ""),
-            )
-            for result in results
-        ]
+        except Exception as e:
+            log.error("Error searching with Valyu: %s", e)
+            return []
 
-    except Exception as e:
-        log.error(f"Error searching with Valyu: {e}")
-        return []
+    # Concurrent identical searches share a single API request
+    return _copy_results(singleflight(key, _search))
@@ -0,0 +1,343 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval.loaders import valyu as valyu_loader
+from open_webui.retrieval.web import valyu as valyu_web
+
+
+class FakeValyuClient:
+    """Stand-in for the ``valyu`` SDK client that records every request."""
+
+    def __init__(
+        self, delay=0.0, fail_urls=(), status=400, search_urls=(), search_success=True
+    ):
+        self.delay = delay
+        self.fail_urls = set(fail_urls)
+        self.status = status
+        self.search_urls = list(search_urls)
+        self.search_success = search_success
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def search(self, query, **kwargs):
+        with self.lock:
+            self.calls.append(query)
+        time.sleep(self.delay)
+        if not self.search_success:
+            return SimpleNamespace(success=False, error="Search failed", results=[])
+        return SimpleNamespace(
+            success=True,
+            error=None,
+            results=[
+                SimpleNamespace(url=url, title=url, content=query)
+                for url in self.search_urls
+            ],
+        )
+
+    def contents(self, urls, **kwargs):
+        with self.lock:
+            self.calls.append(list(urls))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if self.fail_urls.intersection(urls):
+            return SimpleNamespace(
+                success=False,
+                error="Invalid URL",
+                tx_id=f"error-{self.status}",
+                results=[],
+            )
+        return SimpleNamespace(
+            success=True,
+            error=None,
+            results=[
+                SimpleNamespace(
+                    url=url,
+                    title=url,
+                    content=f"content of {url}",
+                    data_type="unstructured",
+                    metadata=None,
+                )
+                for url in urls
+            ],
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_valyu_caches():
+    valyu_loader._URL_CACHE.clear()
+    valyu_web._SEARCH_CACHE.clear()
+    yield
+    valyu_loader._URL_CACHE.clear()
+    valyu_web._SEARCH_CACHE.clear()
+
+
+def make_loader(urls, client, **kwargs):
+    loader = valyu_loader.ValyuLoader(urls=urls, api_key="test-key", **kwargs)
+    loader.client = client
+    return loader
+
+
+def test_lazy_load_close_stops_producer():
+    urls = [f"https://example{i}.com" for i in range(50)]
+    client = FakeValyuClient(delay=0.02)
+    loader = make_loader(urls, client, batch_size=1, max_concurrency=1)
+
+    documents = loader.lazy_load()
+    next(documents)
+    documents.close()
+
+    time.sleep(0.3)
+    calls = len(client.calls)
+    time.sleep(0.3)
+    assert len(client.calls) == calls
+    assert calls < len(urls)
+
+
+def test_lazy_load_propagates_errors_without_continue_on_failure():
+    client = FakeValyuClient(fail_urls={"https://bad.com"})
+    loader = make_loader(
+        ["https://good.com", "https://bad.com"],
+        client,
+        batch_size=1,
+        continue_on_failure=False,
+    )
+
+    with pytest.raises(Exception, match="Valyu API error"):
+        list(loader.lazy_load())
+
+
+def test_lazy_load_skips_failed_batches_with_continue_on_failure():
+    client = FakeValyuClient(fail_urls={"https://bad.com"})
+    loader = make_loader(
+        ["https://good.com", "https://bad.com"],
+        client,
+        batch_size=1,
+        continue_on_failure=True,
+    )
+
+    documents = list(loader.lazy_load())
+    assert [document.metadata["source"] for document in documents] == [
+        "https://good.com"
+    ]
+
+
+def test_lazy_load_does_not_hang_when_producer_dies(monkeypatch):
+    monkeypatch.setattr(
+        valyu_loader.ValyuLoader, "_producer", lambda self, urls, q, stop: None
+    )
+    loader = make_loader(["https://example.com"], FakeValyuClient())
+
+    with pytest.raises(RuntimeError):
+        list(loader.lazy_load())
+
+
+def test_failed_batch_is_split_per_url_on_bad_request():
+    urls = ["https://good.com", "https://bad.com", "https://other.com"]
+    client = FakeValyuClient(fail_urls={"https://bad.com"}, status=400)
+    loader = make_loader(urls, client, continue_on_failure=True)
+
+    documents = list(loader.lazy_load())
+    assert sorted(document.metadata["source"] for document in documents) == [
+        "https://good.com",
+        "https://other.com",
+    ]
+    assert len(client.calls) == 1 + len(urls)
+
+
+@pytest.mark.parametrize("status", [401, 429, 503])
+def test_failed_batch_is_not_split_on_request_wide_errors(status):
+    urls = ["https://good.com", "https://bad.com", "https://other.com"]
+    client = FakeValyuClient(fail_urls={"https://bad.com"}, status=status)
+    loader = make_loader(urls, client, continue_on_failure=True)
+
+    assert list(loader.lazy_load()) == []
+    assert len(client.calls) == 1
+
+
+def test_per_url_fallback_respects_max_concurrency():
+    urls = [f"https://example{i}.com" for i in range(49)] + ["https://bad.com"]
+    client = FakeValyuClient(delay=0.01, fail_urls=set(urls), status=400)
+    loader = make_loader(urls, client, max_concurrency=5, continue_on_failure=True)
+
+    assert list(loader.lazy_load()) == []
+    assert len(client.calls) == 5 + len(urls)
+    assert client.max_in_flight <= 5
+
+
+@pytest.mark.parametrize(
+    "filter_list, url, allowed",
+    [
+        (None, "https://anything.org/", True),
+        ([".example.com"], "https://x.example.com/", True),
+        ([".example.com"], "https://example.com/", False),
+        ([".example.com"], "https://badexample.com/", False),
+        (["example.com"], "https://example.com/", True),
+        (["example.com"], "https://x.example.com:8443/page", True),
+        (["example.com"], "https://badexample.com/", False),
+        (["Example.COM"], "https://X.example.com/", True),
+        (["example.com"], "not a url", False),
+    ],
+)
+def test_domain_filter(filter_list, url, allowed):
+    assert valyu_web._make_domain_filter(filter_list)(url) is allowed
+
+
+def test_search_valyu_applies_domain_filter(monkeypatch):
+    client = FakeValyuClient(
+        search_urls=["https://x.example.com/a", "https://badexample.com/b"]
+    )
+    monkeypatch.setattr(valyu_web, "get_valyu_client", lambda api_key: client)
+
+    results = valyu_web.search_valyu("test-key", "query", 5, [".example.com"])
+    assert [result.link for result in results] == ["https://x.example.com/a"]
+
+
+def run_concurrently(fn, count=8):
+    barrier = threading.Barrier(count)
+    outcomes = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            outcomes[index] = fn()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    outcomes = run_concurrently(lambda: valyu_loader.singleflight("key", fetch))
+    assert outcomes == ["result"] * 8
+    assert len(calls) == 1
+
+
+def test_singleflight_shares_exceptions():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    outcomes = run_concurrently(lambda: valyu_loader.singleflight("key", fetch))
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert len(calls) == 1
+
+
+def test_search_valyu_coalesces_concurrent_searches(monkeypatch):
+    client = FakeValyuClient(delay=0.1, search_urls=["https://example.com/"])
+    monkeypatch.setattr(valyu_web, "get_valyu_client", lambda api_key: client)
+
+    outcomes = run_concurrently(lambda: valyu_web.search_valyu("test-key", "q", 5))
+    assert all(len(outcome) == 1 for outcome in outcomes)
+    assert client.calls == ["q"]
+
+
+def test_overlapping_loaders_fetch_shared_urls_once():
+    client = FakeValyuClient(delay=0.2)
+    first = make_loader(["https://a.com", "https://b.com"], client)
+    second = make_loader(["https://a.com", "https://c.com"], client)
+    documents = {}
+
+    def load(name, loader):
+        documents[name] = sorted(d.metadata["source"] for d in loader.lazy_load())
+
+    threads = [threading.Thread(target=load, args=("first", first))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=load, args=("second", second)))
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+
+    assert documents == {
+        "first": ["https://a.com", "https://b.com"],
+        "second": ["https://a.com", "https://c.com"],
+    }
+    assert sorted(url for urls in client.calls for url in urls) == [
+        "https://a.com",
+        "https://b.com",
+        "https://c.com",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_alazy_load_coalesces_in_flight_urls(monkeypatch):
+    requested = []
+
+    async def post_valyu(api_key, endpoint, payload, trust_env=False):
+        requested.extend(payload["urls"])
+        await asyncio.sleep(0.1)
+        return SimpleNamespace(
+            success=True,
+            error=None,
+            status=200,
+            results=[
+                SimpleNamespace(url=url, title=url, content=url)
+                for url in payload["urls"]
+            ],
+        )
+
+    monkeypatch.setattr(valyu_loader, "post_valyu", post_valyu)
+    first = make_loader(["https://a.com", "https://b.com"], FakeValyuClient())
+    second = make_loader(["https://a.com", "https://c.com"], FakeValyuClient())
+
+    async def load(loader):
+        return sorted([d.metadata["source"] async for d in loader.alazy_load()])
+
+    assert await asyncio.gather(load(first), load(second)) == [
+        ["https://a.com", "https://b.com"],
+        ["https://a.com", "https://c.com"],
+    ]
+    assert sorted(requested) == ["https://a.com", "https://b.com", "https://c.com"]
+
+
+def test_successful_pages_are_cached():
+    client = FakeValyuClient()
+    list(make_loader(["https://example.com"], client).lazy_load())
+    documents = list(make_loader(["https://example.com"], client).lazy_load())
+
+    assert [document.page_content for document in documents] == [
+        "content of https://example.com"
+    ]
+    assert len(client.calls) == 1
+
+
+def test_failed_pages_are_not_cached():
+    client = FakeValyuClient(fail_urls={"https://example.com"}, status=401)
+    for _ in range(2):
+        loader = make_loader(["https://example.com"], client, continue_on_failure=True)
+        assert list(loader.lazy_load()) == []
+
+    assert len(client.calls) == 2
+
+
+def test_failed_searches_are_not_cached(monkeypatch):
+    client = FakeValyuClient(search_success=False)
+    monkeypatch.setattr(valyu_web, "get_valyu_client", lambda api_key: client)
+
+    assert valyu_web.search_valyu("test-key", "q", 5) == []
+    assert valyu_web.search_valyu("test-key", "q", 5) == []
+    assert client.calls == ["q", "q"]